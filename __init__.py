@@ -1,5 +1,8 @@
 from flask import Flask, Blueprint, jsonify, request
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from decimal import Decimal
+import orjson
 from supabase import create_client, Client
 from config import Config
 from dotenv import load_dotenv
@@ -13,8 +16,36 @@ import unlicensedminer
 import authentication
 
 
+def _orjson_default(obj):
+    # orjson has no native Decimal support; serialize it like Flask does
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson for faster response serialization."""
+
+    option = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_orjson_default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Write the encoded bytes straight into the response body
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_orjson_default, option=self.option),
+            mimetype='application/json'
+        )
+
+
 def create_app(config_class=Config):
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     app.config.from_object(config_class)
 
     # Enable CORS for all routes
@@ -34,6 +65,8 @@ def create_app(config_class=Config):
     load_dotenv()  # Load environment variables from .env file
     supabase: Client = create_client(app.config['SUPABASE_URL'], app.config['SUPABASE_KEY'])
     app.supabase = supabase  # Attach Supabase client to the app
+    # Public URL prefix for objects in the documents storage bucket
+    app.config['DOCUMENTS_PUBLIC_URL'] = f"{supabase.storage_url}/object/public/documents/"
 
     @app.before_request
     def before_request():
@@ -1,8 +1,6 @@
 from flask import jsonify, request, current_app
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 def init_routes(bp):
@@ -13,10 +11,15 @@ def init_routes(bp):
             supabase = current_app.supabase
 
             # Log the received data for debugging
-            logger.debug(f"Received data: {data}")
+            logger.debug("Received data: %s", data)
 
             # Validate required fields
-            if not all([data.get('name'), data.get('email'), data.get('message')]):
+            try:
+                name, email, message = data['name'], data['email'], data['message']
+            except (KeyError, TypeError):
+                name = email = message = None
+
+            if not (name and email and message):
                 return jsonify({
                     "error": "Missing required fields",
                     "details": "Name, email, and message are required"
@@ -24,16 +27,16 @@ def init_routes(bp):
 
             # Prepare the data for insertion (only fields shown in the FE image)
             contact_data = {
-                'name': data['name'],
-                'email': data['email'],
-                'message': data['message']
+                'name': name,
+                'email': email,
+                'message': message
             }
 
             # Insert data into Supabase
             response = supabase.table('contact_data').insert(contact_data).execute()
 
             # Log the response from Supabase
-            logger.debug(f"Supabase response: {response}")
+            logger.debug("Supabase response: %s", response)
 
             if response.data:
                 return jsonify({
@@ -57,7 +60,7 @@ def init_routes(bp):
             supabase = current_app.supabase
             response = supabase.table('contact_data').select('*').execute()
 
-            logger.debug(f"Fetched contacts: {response.data}")
+            logger.debug("Fetched contacts: %s", response.data)
 
             if response.data:
                 return jsonify(response.data), 200
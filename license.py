@@ -2,32 +2,46 @@ from flask import jsonify, request, current_app
 import os
 from werkzeug.utils import secure_filename
 import logging
+import math
 import re
+import tempfile
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Define the allowed file extensions for uploads
 ALLOWED_EXTENSIONS = {'pdf', 'png', 'jpg', 'jpeg'}
+_ALLOWED_SUFFIXES = tuple(f'.{ext}' for ext in ALLOWED_EXTENSIONS)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('miner_application.log'),
-        logging.StreamHandler()
-    ]
+# Maximum number of concurrent file uploads per license submission
+MAX_UPLOAD_WORKERS = 8
+
+# Fields that must be present in every license application
+REQUIRED_FIELDS = (
+    'exploration_license_no', 'applicant_name', 'national_id',
+    'employment', 'place_of_business', 'residence', 'company_name', 'country_of_incorporation',
+    'head_office_address', 'registered_address_in_sri_lanka', 'capitalization',
+    'blasting_method', 'depth_of_borehole', 'production_volume', 'machinery_used',
+    'underground_mining_depth', 'explosives_type', 'land_name', 'land_owner_name',
+    'village_name', 'grama_niladhari_division', 'divisional_secretary_division',
+    'administrative_district', 'nature_of_bound', 'minerals_to_be_mined',
+    'industrial_mining_license_no', 'period_of_validity', 'royalty_payable'
 )
+
+# Precompiled patterns for cleaning numeric values; longer units come first
+# so they win over the single-character alternatives
+_UNITS_RE = re.compile(r'usd|tons/day|years?|[,$m%]')
+_NUM_RE = re.compile(r'[\d.]+')
+
 logger = logging.getLogger(__name__)
 
 def allowed_file(filename):
     """Check if the file has an allowed extension."""
-    logger.debug(f"Checking if file {filename} is allowed")
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(_ALLOWED_SUFFIXES)
 
-def save_file(file, folder):
+def save_file(file):
     """Upload file to Supabase storage bucket."""
-    logger.debug(f"Attempting to save file: {file.filename if file else 'None'}")
+    logger.debug("Attempting to save file: %s", file.filename if file else 'None')
     
     if file and allowed_file(file.filename):
         try:
@@ -36,49 +50,52 @@ def save_file(file, folder):
             file_ext = filename.split('.')[-1]
             unique_filename = f"{uuid.uuid4()}.{file_ext}"
             
-            logger.debug(f"Generated unique filename: {unique_filename}")
+            logger.debug("Generated unique filename: %s", unique_filename)
             
-            # Get file content
-            file_content = file.read()
-            logger.debug(f"File size: {len(file_content)} bytes")
-            logger.debug(f"Content type: {file.content_type}")
+            logger.debug("Content type: %s", file.content_type)
             
             # Upload to Supabase storage
             supabase = current_app.supabase
             
-            # Debug: Check available buckets
-            try:
-                buckets = supabase.storage.list_buckets()
-                logger.debug(f"Available buckets: {[b['name'] for b in buckets]}")
-            except Exception as e:
-                logger.error(f"Error listing buckets: {str(e)}", exc_info=True)
-                return None
+            # Spool the upload to disk and stream it from there instead of
+            # buffering the whole file in memory
+            chunk_size = current_app.config['UPLOAD_CHUNK_SIZE']
+            fd, tmp_path = tempfile.mkstemp()
             
             # Upload file
             logger.debug("Attempting file upload to Supabase storage")
             try:
-                response = supabase.storage.from_('documents').upload(
-                    unique_filename,
-                    file_content,
-                    file_options={
-                        "content-type": file.content_type,
-                        "cache-control": "3600",
-                        "upsert": False
-                    }
-                )
+                with os.fdopen(fd, 'wb') as tmp_file:
+                    for chunk in iter(lambda: file.stream.read(chunk_size), b''):
+                        tmp_file.write(chunk)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("File size: %d bytes", os.path.getsize(tmp_path))
+                
+                with open(tmp_path, 'rb') as file_stream:
+                    response = supabase.storage.from_('documents').upload(
+                        unique_filename,
+                        file_stream,
+                        file_options={
+                            "content-type": file.content_type,
+                            "cache-control": "3600",
+                            "upsert": False
+                        }
+                    )
                 
                 if not response:
                     logger.error("Upload failed - no response received")
                     raise Exception("Upload failed - no response received")
                 
                 # Get the public URL for the uploaded file
-                file_url = supabase.storage.from_('documents').get_public_url(unique_filename)
+                file_url = current_app.config['DOCUMENTS_PUBLIC_URL'] + unique_filename
                 logger.info(f"File uploaded successfully. Public URL: {file_url}")
                 
                 return file_url
             except Exception as upload_error:
                 logger.error(f"Upload error: {str(upload_error)}", exc_info=True)
                 return None
+            finally:
+                os.remove(tmp_path)
                 
         except Exception as e:
             logger.error(f"Error in save_file: {str(e)}", exc_info=True)
@@ -89,45 +106,48 @@ def save_file(file, folder):
 
 def clean_numeric_value(value):
     """Clean numeric values by removing special characters and units."""
-    logger.debug(f"Cleaning numeric value: {value}")
+    logger.debug("Cleaning numeric value: %s", value)
     
     if value is None:
         logger.debug("Value is None, returning None")
         return None
         
     if isinstance(value, (int, float)):
-        logger.debug(f"Value is already numeric: {value}")
+        logger.debug("Value is already numeric: %s", value)
         return float(value)
         
     if isinstance(value, str):
-        logger.debug(f"Processing string value: {value}")
+        logger.debug("Processing string value: %s", value)
+        # Fast path for values that are already plain decimal numbers. Only
+        # digits and dots are accepted so float() never sees signs, exponents
+        # or "nan"/"inf", which the regex path below would not produce.
+        plain_value = value.replace(',', '').strip()
+        if _NUM_RE.fullmatch(plain_value):
+            try:
+                result = float(plain_value)
+            except ValueError:
+                pass  # e.g. "1.2.3", left to the regex path
+            else:
+                return result if math.isfinite(result) else None
+
         # Remove common units and special characters
         original_value = value
-        value = value.lower().strip()
-        value = value.replace(',', '')
-        value = value.replace('usd', '')
-        value = value.replace('$', '')
-        value = value.replace('tons/day', '')
-        value = value.replace('m', '')
-        value = value.replace('%', '')
-        value = value.replace('years', '')
-        value = value.replace('year', '')
-        value = value.strip()
+        value = _UNITS_RE.sub('', value.lower()).strip()
         
-        logger.debug(f"After cleaning: {value}")
+        logger.debug("After cleaning: %s", value)
         
         # Extract the first number found
-        number_match = re.search(r'[\d.]+', value)
+        number_match = _NUM_RE.search(value)
         if number_match:
             try:
                 result = float(number_match.group())
-                logger.debug(f"Extracted number: {result}")
+                logger.debug("Extracted number: %s", result)
                 return result
             except (ValueError, TypeError) as e:
                 logger.warning(f"Could not convert {number_match.group()} to float: {str(e)}")
                 return None
         else:
-            logger.debug(f"No numbers found in: {original_value}")
+            logger.debug("No numbers found in: %s", original_value)
     return None
 
 def init_routes(bp):
@@ -138,23 +158,18 @@ def init_routes(bp):
             # Get authenticated user ID
             logger.debug("Checking for user ID in cookies/headers")
             user_id = request.cookies.get('userId') or request.headers.get('X-User-ID')
-            logger.debug(f"Extracted user_id: {user_id}")
+            logger.debug("Extracted user_id: %s", user_id)
             
             if not user_id:
                 logger.error("No user ID provided in request")
                 return jsonify({"error": "User ID not provided"}), 401
 
-            # Create upload folder
-            upload_folder = os.path.join(current_app.root_path, 'uploads')
-            logger.debug(f"Ensuring upload folder exists: {upload_folder}")
-            os.makedirs(upload_folder, exist_ok=True)
-
             # Prepare form data with automatic miner_id assignment
             logger.debug("Preparing form data")
             if request.is_json:
                 logger.debug("Processing JSON request")
                 data = request.get_json()
-                logger.debug(f"Raw JSON data: {data}")
+                logger.debug("Raw JSON data: %s", data)
                 
                 form_data = {
                     "miner_id": user_id,
@@ -190,7 +205,7 @@ def init_routes(bp):
                     "royalty_payable": clean_numeric_value(request.form.get('royalty_payable'))
 
                 }
-                logger.debug(f"Form data from JSON: {form_data}")
+                logger.debug("Form data from JSON: %s", form_data)
             else:
                 logger.debug("Processing form data request")
                 form_data = {
@@ -227,7 +242,7 @@ def init_routes(bp):
                     "royalty_payable": clean_numeric_value(request.form.get('royalty_payable'))
 
                 }
-                logger.debug(f"Initial form data: {form_data}")
+                logger.debug("Initial form data: %s", form_data)
 
                 # Handle file uploads
                 logger.debug("Processing file uploads")
@@ -238,35 +253,34 @@ def init_routes(bp):
                     'director_general_signature'
                 ]
 
+                uploads = []
                 for field in file_fields:
                     file = request.files.get(field)
-                    logger.debug(f"Processing field {field}: {file.filename if file else 'None'}")
+                    logger.debug("Processing field %s: %s", field, file.filename if file else 'None')
                     if file:
-                        file_path = save_file(file, upload_folder)
-                        form_data[field] = file_path
-                        logger.debug(f"Saved file for {field} to: {file_path}")
+                        uploads.append((field, file))
                     else:
                         form_data[field] = None
-                        logger.debug(f"No file provided for {field}")
+                        logger.debug("No file provided for %s", field)
+
+                # Uploads are independent network calls, so run them concurrently.
+                # Worker threads need their own app context for current_app.
+                app = current_app._get_current_object()
+
+                def upload(item):
+                    field, file = item
+                    with app.app_context():
+                        return field, save_file(file)
+
+                if uploads:
+                    with ThreadPoolExecutor(max_workers=min(MAX_UPLOAD_WORKERS, len(uploads))) as pool:
+                        for field, file_path in pool.map(upload, uploads):
+                            form_data[field] = file_path
+                            logger.debug("Saved file for %s to: %s", field, file_path)
 
             # Validate required fields
-            required_fields = [
-                'exploration_license_no', 'applicant_name', 'national_id',
-                'employment', 'place_of_business', 'residence', 'company_name', 'country_of_incorporation',
-                'head_office_address', 'registered_address_in_sri_lanka', 'capitalization',
-                'blasting_method', 'depth_of_borehole', 'production_volume', 'machinery_used',
-                'underground_mining_depth', 'explosives_type', 'land_name', 'land_owner_name',
-                'village_name', 'grama_niladhari_division', 'divisional_secretary_division',
-                'administrative_district', 'nature_of_bound', 'minerals_to_be_mined',
-                'industrial_mining_license_no', 'period_of_validity', 'royalty_payable'
-            ]
             logger.debug("Validating required fields")
-
-            missing_fields = []
-            for field in required_fields:
-                if field not in form_data or form_data[field] is None:
-                    missing_fields.append(field)
-                    logger.warning(f"Missing or invalid field: {field}")
+            missing_fields = [field for field in REQUIRED_FIELDS if form_data.get(field) is None]
 
             if missing_fields:
                 logger.error(f"Missing required fields: {missing_fields}")
@@ -276,9 +290,10 @@ def init_routes(bp):
             logger.debug("Attempting to insert data into Supabase")
             try:
                 supabase = current_app.supabase
-                logger.debug(f"Inserting data: {form_data}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Inserting data: %s", form_data)
                 response = supabase.table('application').insert(form_data).execute()
-                logger.debug(f"Supabase response: {response}")
+                logger.debug("Supabase response: %s", response)
                 
                 if not response.data:
                     logger.error("No data returned from Supabase insert")
@@ -292,10 +307,10 @@ def init_routes(bp):
                     'license_status': 'pending',
                     'active_date': datetime.now().isoformat()
                 }
-                logger.debug(f"Update data: {update_data}")
+                logger.debug("Update data: %s", update_data)
                 
                 update_response = supabase.table('users').update(update_data).eq('id', user_id).execute()
-                logger.debug(f"User update response: {update_response}")
+                logger.debug("User update response: %s", update_response)
                 
                 logger.info("Successfully updated user status")
 
@@ -321,7 +336,7 @@ def init_routes(bp):
         try:
             # Get authenticated user ID
             user_id = request.cookies.get('userId') or request.headers.get('X-User-ID')
-            logger.debug(f"User ID from request: {user_id}")
+            logger.debug("User ID from request: %s", user_id)
             
             if not user_id:
                 logger.error("No user ID provided")
@@ -336,8 +351,9 @@ def init_routes(bp):
                                  .eq('miner_id', user_id) \
                                  .execute()
                                  
-                logger.debug(f"Retrieved {len(response.data)} applications")
-                logger.debug(f"Sample application data: {response.data[:1] if response.data else 'None'}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Retrieved %d applications", len(response.data))
+                    logger.debug("Sample application data: %s", response.data[:1] if response.data else 'None')
                 
                 return jsonify(response.data), 200
                 
@@ -1,19 +1,16 @@
-from flask import Blueprint, jsonify, request
-from supabase import create_client, Client
-from config import Config
-from datetime import datetime, timedelta
+from flask import Blueprint, jsonify, request, current_app
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 import logging
 import re
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create a Blueprint for miner-related routes
 minerpage_bp = Blueprint('minerpage', __name__, url_prefix='/miner')
 
-# Initialize Supabase client
-supabase = create_client(Config.SUPABASE_URL, Config.SUPABASE_KEY)
+# Precompiled pattern for extracting the number from period strings
+_PERIOD_RE = re.compile(r'\d+')
 
 def get_user_id():
     """Helper function to get user_id from cookies"""
@@ -23,23 +20,22 @@ def get_user_id():
         return None
     return user_id
 
+@lru_cache(maxsize=64)
 def parse_period(period_str):
     """Robustly parse period strings into years"""
     try:
         period = str(period_str).lower()
         # Extract first number found
-        num_match = re.search(r'\d+', period)
-        if not num_match:
+        period_match = _PERIOD_RE.search(period)
+        if not period_match:
             return 1  # Default to 1 year
         
-        num = int(num_match.group())
+        num = int(period_match.group())
         
+        # The unit can appear anywhere, e.g. "6-month" or "Months: 6"
         if 'month' in period:
             return num / 12
-        elif any(x in period for x in ['year', 'yr', 'y']):
-            return num
-        else:
-            return num  # Assume years if no unit specified
+        return num  # Years, or no unit specified
     except Exception as e:
         logger.warning(f"Couldn't parse period '{period_str}': {str(e)}")
         return 1  # Default to 1 year on error
@@ -53,10 +49,8 @@ def parse_date(date_str):
         if isinstance(date_str, datetime):
             return date_str.date()
             
-        if 'T' in date_str:  # ISO format
-            return datetime.strptime(date_str.split('T')[0], '%Y-%m-%d').date()
-        else:  # Simple date
-            return datetime.strptime(date_str, '%Y-%m-%d').date()
+        # ISO timestamps and simple dates both start with YYYY-MM-DD
+        return date.fromisoformat(date_str[:10])
     except Exception as e:
         logger.error(f"Failed to parse date '{date_str}': {str(e)}")
         return None
@@ -68,10 +62,13 @@ def get_license():
         if not user_id:
             return jsonify({"error": "User ID not provided"}), 401
 
-        # Fetch user data
+        supabase = current_app.supabase
+
+        # Fetch user data with the embedded application in one round-trip
         user_data = supabase.table('users') \
-                          .select("license_status, active_date") \
+                          .select("license_status, active_date, application(exploration_license_no, period_of_validity)") \
                           .eq('id', user_id) \
+                          .limit(1, foreign_table='application') \
                           .execute().data
         
         if not user_data:
@@ -84,11 +81,7 @@ def get_license():
         if not active_date:
             return jsonify({"error": "Invalid or missing active date"}), 400
 
-        # Fetch application data
-        app_data = supabase.table('application') \
-                         .select("exploration_license_no, period_of_validity") \
-                         .eq('miner_id', user_id) \
-                         .execute().data
+        app_data = user_data.get('application')
                          
         if not app_data:
             return jsonify({"error": "No application found"}), 404
@@ -120,9 +113,12 @@ def get_royalty():
         if not user_id:
             return jsonify({"error": "User ID not provided"}), 401
 
+        supabase = current_app.supabase
+
         royalty_data = supabase.table('royalty') \
                             .select("total_amount") \
                             .eq('miner_id', user_id) \
+                            .limit(1) \
                             .execute().data
                             
         if not royalty_data:
@@ -145,6 +141,8 @@ def get_announcements():
         if not user_id:
             return jsonify({"error": "User ID not provided"}), 401
 
+        supabase = current_app.supabase
+
         announcements = supabase.table('comments') \
                              .select("text, created_at") \
                              .eq('miner_id', user_id) \
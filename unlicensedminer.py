@@ -1,21 +1,24 @@
-from flask import jsonify, request
-from supabase import create_client, Client
-from config import Config
+from flask import jsonify, request, current_app
 from flask import Blueprint
-import uuid
+from storage3.exceptions import StorageApiError
+import hashlib
+import os
+import tempfile
 from datetime import datetime
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Month abbreviations for formatting ISO dates without strftime
+_MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+# Pagination bounds for announcements
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
 # Create the blueprint
 unlicensedminer_bp = Blueprint('unlicensedminer', __name__, url_prefix='/unlicensedminer')
 
-# Initialize Supabase client
-supabase: Client = create_client(Config.SUPABASE_URL, Config.SUPABASE_KEY)
-
 def get_user_id():
     """Consistent user ID retrieval from cookies/headers (matches minerpage.py)"""
     user_id = request.cookies.get('userId') or request.headers.get('X-User-ID')
@@ -30,12 +33,15 @@ def get_user_status():
         if not user_id:
             return jsonify({"error": "Authentication required"}), 401
 
+        supabase = current_app.supabase
+
         logger.info(f"Fetching status for miner_id: {user_id}")
         
         # Query application table using miner_id (FK to users.id)
         response = supabase.table('application') \
                          .select('status') \
                          .eq('miner_id', user_id) \
+                         .limit(1) \
                          .execute()
 
         if not response.data:
@@ -61,10 +67,13 @@ def get_application_details():
         if not user_id:
             return jsonify({"error": "Authentication required"}), 401
 
+        supabase = current_app.supabase
+
         # Get all application details using miner_id
         response = supabase.table('application') \
                          .select('*') \
                          .eq('miner_id', user_id) \
+                         .limit(1) \
                          .execute()
 
         if not response.data:
@@ -83,6 +92,8 @@ def get_documents():
         if not user_id:
             return jsonify({"error": "Authentication required"}), 401
 
+        supabase = current_app.supabase
+
         # Get all documents using miner_id
         response = supabase.table('documents') \
                          .select('*') \
@@ -102,6 +113,8 @@ def upload_document():
         if not user_id:
             return jsonify({"error": "Authentication required"}), 401
 
+        supabase = current_app.supabase
+
         if 'file' not in request.files:
             return jsonify({"error": "No file uploaded"}), 400
 
@@ -111,16 +124,34 @@ def upload_document():
         if file.filename == '':
             return jsonify({"error": "No selected file"}), 400
 
-        # Generate unique filename
         file_extension = file.filename.split('.')[-1]
-        unique_filename = f"{uuid.uuid4()}.{file_extension}"
         
-        # Upload file to Supabase storage
-        file_bytes = file.read()
-        supabase.storage.from_('documents').upload(unique_filename, file_bytes)
+        # Spool the upload to disk, hashing it on the way, and stream it to
+        # Supabase storage instead of buffering the whole file in memory
+        chunk_size = current_app.config['UPLOAD_CHUNK_SIZE']
+        digest = hashlib.blake2b(digest_size=16)
+        fd, tmp_path = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                for chunk in iter(lambda: file.stream.read(chunk_size), b''):
+                    digest.update(chunk)
+                    tmp_file.write(chunk)
+            
+            # Name the object after its content so identical uploads are stored once
+            unique_filename = f"{digest.hexdigest()}.{file_extension}"
+            
+            try:
+                with open(tmp_path, 'rb') as file_stream:
+                    supabase.storage.from_('documents').upload(unique_filename, file_stream)
+            except StorageApiError as e:
+                if str(e.status) != '409':
+                    raise
+                logger.info(f"Document {unique_filename} already stored, skipping upload")
+        finally:
+            os.remove(tmp_path)
         
         # Get public URL
-        file_url = supabase.storage.from_('documents').get_public_url(unique_filename)
+        file_url = current_app.config['DOCUMENTS_PUBLIC_URL'] + unique_filename
         
         # Save document metadata using miner_id
         document_data = {
@@ -150,18 +181,30 @@ def get_announcements():
         if not user_id:
             return jsonify({"error": "Authentication required"}), 401
 
+        supabase = current_app.supabase
+
+        try:
+            page = max(int(request.args.get('page', 0)), 0)
+            size = min(max(int(request.args.get('size', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        except ValueError:
+            return jsonify({"error": "Invalid pagination parameters"}), 400
+
         # Updated query to match actual table structure
         response = supabase.table('comments') \
                          .select('text, created_at') \
                          .eq('miner_id', user_id) \
                          .order('created_at', desc=True) \
+                         .range(page * size, page * size + size - 1) \
                          .execute()
 
         # Format the response to match your frontend expectations
         announcements = []
         for item in response.data:
             date_str = item.get('created_at', '')
-            date_display = datetime.fromisoformat(date_str).strftime('%b %d, %Y') if date_str else ''
+            date_display = ''
+            if date_str:
+                # created_at is ISO formatted, so slice out the date parts directly
+                date_display = f"{_MONTHS[int(date_str[5:7]) - 1]} {date_str[8:10]}, {date_str[0:4]}"
             
             announcements.append({
                 "text": item.get('text', ''),